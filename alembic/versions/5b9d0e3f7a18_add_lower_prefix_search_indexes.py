@@ -0,0 +1,32 @@
+"""add lower prefix search indexes
+
+Revision ID: 5b9d0e3f7a18
+Revises: c41e7d5a0f62
+Create Date: 2026-10-15 11:26:07.553941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9d0e3f7a18'
+down_revision: Union[str, None] = 'c41e7d5a0f62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX users_email_lower_prefix ON users (lower(email) text_pattern_ops)")
+    op.execute("CREATE INDEX users_nickname_lower_prefix ON users (lower(nickname) text_pattern_ops)")
+    op.execute("CREATE INDEX users_first_name_lower_prefix ON users (lower(first_name) text_pattern_ops)")
+    op.execute("CREATE INDEX users_last_name_lower_prefix ON users (lower(last_name) text_pattern_ops)")
+
+
+def downgrade() -> None:
+    op.drop_index('users_last_name_lower_prefix', table_name='users')
+    op.drop_index('users_first_name_lower_prefix', table_name='users')
+    op.drop_index('users_nickname_lower_prefix', table_name='users')
+    op.drop_index('users_email_lower_prefix', table_name='users')
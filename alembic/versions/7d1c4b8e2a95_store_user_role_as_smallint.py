@@ -0,0 +1,38 @@
+"""store user role as smallint
+
+Revision ID: 7d1c4b8e2a95
+Revises: e2a6f19c4d30
+Create Date: 2026-10-15 13:58:42.271604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d1c4b8e2a95'
+down_revision: Union[str, None] = 'e2a6f19c4d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE users ALTER COLUMN role TYPE SMALLINT USING "
+        "CASE role::text WHEN 'ANONYMOUS' THEN 0 WHEN 'AUTHENTICATED' THEN 1 "
+        "WHEN 'MANAGER' THEN 2 WHEN 'ADMIN' THEN 3 END"
+    )
+    op.execute('DROP TYPE "UserRole"')
+    op.create_check_constraint('ck_users_role', 'users', 'role BETWEEN 0 AND 3')
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_users_role', 'users', type_='check')
+    op.execute("""CREATE TYPE "UserRole" AS ENUM ('ANONYMOUS', 'AUTHENTICATED', 'MANAGER', 'ADMIN')""")
+    op.execute(
+        'ALTER TABLE users ALTER COLUMN role TYPE "UserRole" USING '
+        "(CASE role WHEN 0 THEN 'ANONYMOUS' WHEN 1 THEN 'AUTHENTICATED' "
+        "WHEN 2 THEN 'MANAGER' WHEN 3 THEN 'ADMIN' END)::\"UserRole\""
+    )
@@ -0,0 +1,33 @@
+"""add trigram search indexes
+
+Revision ID: 8f3a2c1d9b47
+Revises: 25d814bc83ed
+Create Date: 2026-10-15 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a2c1d9b47'
+down_revision: Union[str, None] = '25d814bc83ed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('users_email_trgm', 'users', ['email'], unique=False, postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'})
+    op.create_index('users_nickname_trgm', 'users', ['nickname'], unique=False, postgresql_using='gin', postgresql_ops={'nickname': 'gin_trgm_ops'})
+    op.create_index('users_first_name_trgm', 'users', ['first_name'], unique=False, postgresql_using='gin', postgresql_ops={'first_name': 'gin_trgm_ops'})
+    op.create_index('users_last_name_trgm', 'users', ['last_name'], unique=False, postgresql_using='gin', postgresql_ops={'last_name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('users_last_name_trgm', table_name='users')
+    op.drop_index('users_first_name_trgm', table_name='users')
+    op.drop_index('users_nickname_trgm', table_name='users')
+    op.drop_index('users_email_trgm', table_name='users')
@@ -0,0 +1,31 @@
+"""add user status partial indexes
+
+Revision ID: a3f8e6d21c57
+Revises: 7d1c4b8e2a95
+Create Date: 2026-10-15 14:47:03.925310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f8e6d21c57'
+down_revision: Union[str, None] = '7d1c4b8e2a95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('users_locked_true', 'users', ['created_at'], unique=False, postgresql_where=sa.text('is_locked = true'))
+    op.create_index('users_unverified', 'users', ['created_at'], unique=False, postgresql_where=sa.text('email_verified = false'))
+    # role is stored as a smallint code; 2 is UserRole.MANAGER
+    op.create_index('users_manager', 'users', ['created_at'], unique=False, postgresql_where=sa.text('role = 2'))
+
+
+def downgrade() -> None:
+    op.drop_index('users_manager', table_name='users')
+    op.drop_index('users_unverified', table_name='users')
+    op.drop_index('users_locked_true', table_name='users')
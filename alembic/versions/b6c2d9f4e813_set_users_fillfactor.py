@@ -0,0 +1,26 @@
+"""set users fillfactor
+
+Revision ID: b6c2d9f4e813
+Revises: a3f8e6d21c57
+Create Date: 2026-10-15 15:52:16.340877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6c2d9f4e813'
+down_revision: Union[str, None] = 'a3f8e6d21c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE users SET (fillfactor = 90)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE users RESET (fillfactor)")
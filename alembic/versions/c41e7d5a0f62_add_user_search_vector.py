@@ -0,0 +1,38 @@
+"""add user search vector
+
+Revision ID: c41e7d5a0f62
+Revises: 8f3a2c1d9b47
+Create Date: 2026-10-15 10:03:54.718230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7d5a0f62'
+down_revision: Union[str, None] = '8f3a2c1d9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(nickname, '') || ' ' || "
+            "coalesce(first_name, '') || ' ' || coalesce(last_name, ''))",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('users_search_vec', 'users', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('users_search_vec', table_name='users')
+    op.drop_column('users', 'search_vector')
@@ -0,0 +1,32 @@
+"""add user filter covering index
+
+Revision ID: e2a6f19c4d30
+Revises: 5b9d0e3f7a18
+Create Date: 2026-10-15 12:41:19.086512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6f19c4d30'
+down_revision: Union[str, None] = '5b9d0e3f7a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'users_role_locked_verified_created',
+        'users',
+        ['role', 'is_locked', 'email_verified', sa.text('created_at DESC')],
+        unique=False,
+        postgresql_include=['id', 'email', 'nickname'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('users_role_locked_verified_created', table_name='users')
@@ -1,5 +1,7 @@
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 Base = declarative_base()
 
@@ -9,10 +11,27 @@ class Database:
     _session_factory = None
 
     @classmethod
-    def initialize(cls, database_url: str, echo: bool = False):
+    def initialize(cls, database_url: str, echo: bool = False, pool_size: int = 25, max_overflow: int = 25):
         """Initialize the async engine and sessionmaker."""
         if cls._engine is None:  # Ensure engine is created once
-            cls._engine = create_async_engine(database_url, echo=echo, future=True)
+            # Always talk to Postgres through the native asyncpg driver
+            database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+            cls._engine = create_async_engine(
+                database_url,
+                echo=echo,
+                future=True,
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_pre_ping=True,
+                pool_recycle=300,
+                connect_args={
+                    "server_settings": {"jit": "off"},
+                    # asyncpg's own statement cache and SQLAlchemy's prepared statement cache
+                    "statement_cache_size": 1024,
+                    "prepared_statement_cache_size": 512,
+                },
+            )
             cls._session_factory = sessionmaker(
                 bind=cls._engine, class_=AsyncSession, expire_on_commit=False, future=True
             )
@@ -23,3 +42,11 @@ class Database:
         if cls._session_factory is None:
             raise ValueError("Database not initialized. Call `initialize()` first.")
         return cls._session_factory
+
+    @classmethod
+    async def check_connection(cls):
+        """Runs a trivial query through the pool to fail fast if the database is unreachable."""
+        if cls._engine is None:
+            raise ValueError("Database not initialized. Call `initialize()` first.")
+        async with cls._engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
@@ -2,23 +2,68 @@ from builtins import bool, int, str
 from datetime import datetime, timezone
 from enum import Enum
 import uuid
+from cachetools import TTLCache
 from sqlalchemy import (
-    Column, String, Integer, DateTime, Boolean, func, Enum as SQLAlchemyEnum, or_
+    String, Integer, SmallInteger, DateTime, Boolean, func, or_, DDL, Index, event, Computed,
+    CheckConstraint, true, false, literal_column
 )
-from sqlalchemy.dialects.postgresql import UUID, ENUM
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID, ENUM, TSVECTOR
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapped, mapped_column, Session
+from sqlalchemy.types import TypeDecorator
 from app.database import Base
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import select
+from sqlalchemy.sql import select, lambda_stmt
+
+# Recent User.search results, keyed by the normalized search arguments. The cache is per
+# process and is only invalidated by writes made through SQLAlchemy sessions and engines in
+# this process: other workers, other applications or raw SQL writing to users can leave
+# stale results in it for up to the 30 second TTL.
+_search_cache = TTLCache(maxsize=1024, ttl=30)
+# Session/connection info key marking user writes that are not committed yet
+_USER_WRITES_PENDING = "search_cache_user_writes_pending"
+
+# Pre-bound to skip the attribute lookups in update_professional_status
+_utcnow = datetime.now
+_utc = timezone.utc
+
+def _escape_like(term: str) -> str:
+    """Escapes LIKE wildcards so user input is matched literally (escape character is a backslash)."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 class UserRole(Enum):
-    """Enumeration of user roles within the application, stored as ENUM in the database."""
+    """Enumeration of user roles within the application, stored as a smallint code in the database."""
     ANONYMOUS = "ANONYMOUS"
     AUTHENTICATED = "AUTHENTICATED"
     MANAGER = "MANAGER"
     ADMIN = "ADMIN"
 
+# Database codes for each role; never renumber existing entries.
+_ROLE_CODES = {
+    UserRole.ANONYMOUS: 0,
+    UserRole.AUTHENTICATED: 1,
+    UserRole.MANAGER: 2,
+    UserRole.ADMIN: 3,
+}
+_ROLES_BY_CODE = {code: role for role, code in _ROLE_CODES.items()}
+# Role codes as SQL literals, for filters that partial indexes on role must be able to match
+_ROLE_LITERALS = {role: literal_column(str(code)) for role, code in _ROLE_CODES.items()}
+
+class UserRoleType(TypeDecorator):
+    """Stores a UserRole as a smallint, translating with a dict lookup in both directions."""
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else _ROLE_CODES[UserRole(value)]
+
+    def process_literal_param(self, value, dialect):
+        return str(self.process_bind_param(value, dialect))
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else _ROLES_BY_CODE[value]
+
 class User(Base):
     """
     Represents a user within the application, corresponding to the 'users' table in the database.
@@ -45,6 +90,7 @@ class User(Base):
         is_locked (bool): Flag indicating if the account is locked.
         created_at (datetime): Timestamp when the user was created, set by the server.
         updated_at (datetime): Timestamp of the last update, set by the server.
+        search_vector (tsvector): Generated full-text document over email, nickname and names, used by search().
 
     Methods:
         lock_account(): Locks the user account.
@@ -57,40 +103,41 @@ class User(Base):
     __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    nickname: Mapped[str] = Column(String(50), unique=True, nullable=False, index=True)
-    email: Mapped[str] = Column(String(255), unique=True, nullable=False, index=True)
-    first_name: Mapped[str] = Column(String(100), nullable=True)
-    last_name: Mapped[str] = Column(String(100), nullable=True)
-    bio: Mapped[str] = Column(String(500), nullable=True)
-    profile_picture_url: Mapped[str] = Column(String(255), nullable=True)
-    linkedin_profile_url: Mapped[str] = Column(String(255), nullable=True)
-    github_profile_url: Mapped[str] = Column(String(255), nullable=True)
-    role: Mapped[UserRole] = Column(SQLAlchemyEnum(UserRole, name='UserRole', create_constraint=True), nullable=False)
-    is_professional: Mapped[bool] = Column(Boolean, default=False)
-    professional_status_updated_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
-    last_login_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
-    failed_login_attempts: Mapped[int] = Column(Integer, default=0)
-    is_locked: Mapped[bool] = Column(Boolean, default=False)
-    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    verification_token = Column(String, nullable=True)
-    email_verified: Mapped[bool] = Column(Boolean, default=False, nullable=False)
-    hashed_password: Mapped[str] = Column(String(255), nullable=False)
-
-    @property
-    def professional_status_updated_at(self) -> Optional[datetime]:
-        """Get the timestamp of the last professional status update."""
-        return self._professional_status_updated_at
-
-    @professional_status_updated_at.setter
-    def professional_status_updated_at(self, value: datetime):
-        """Set the timestamp of the last professional status update."""
-        self._professional_status_updated_at = value
+    nickname: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
+    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    first_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    last_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    bio: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    profile_picture_url: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    linkedin_profile_url: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    github_profile_url: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    role: Mapped[UserRole] = mapped_column(
+        UserRoleType, CheckConstraint("role BETWEEN 0 AND 3", name="ck_users_role"), nullable=False
+    )
+    is_professional: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    professional_status_updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_login_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    failed_login_attempts: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    is_locked: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    verification_token: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    email_verified: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(nickname, '') || ' ' || "
+            "coalesce(first_name, '') || ' ' || coalesce(last_name, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     def update_professional_status(self, is_professional: bool):
         """Update the professional status and set the timestamp."""
         self.is_professional = is_professional
-        self.professional_status_updated_at = datetime.now(timezone.utc)
+        self.professional_status_updated_at = _utcnow(_utc)
 
     def __repr__(self) -> str:
         """Provides a readable representation of a user object."""
@@ -106,7 +153,7 @@ class User(Base):
         self.email_verified = True
 
     def has_role(self, role_name: UserRole) -> bool:
-        return self.role == role_name
+        return self.role is role_name
 
     @classmethod
     async def search(cls, session: AsyncSession, 
@@ -115,38 +162,305 @@ class User(Base):
                     is_locked: Optional[bool] = None,
                     is_verified: Optional[bool] = None,
                     registration_start: Optional[datetime] = None,
-                    registration_end: Optional[datetime] = None) -> List["User"]:
+                    registration_end: Optional[datetime] = None,
+                    prefix_only: bool = False,
+                    limit: int = 50,
+                    offset: int = 0,
+                    after_id: Optional[uuid.UUID] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
         """
-        Search for users based on various criteria
+        Search for users based on various criteria, one page at a time.
+
+        Returns the page of users together with the total number of matches. Users are
+        plain dicts holding only the columns the API responds with, so no ORM instances
+        are built for this read-only path. The total comes from a COUNT(*) OVER() window
+        on the same query, avoiding a second round-trip in the common case.
+
+        search_term matches users with the term as a substring of email, nickname, first
+        name or last name, served by the trigram indexes. A term of several words also
+        matches through the search_vector full-text index when every word appears in one
+        of those fields, so "john doe" finds John Doe; both run in the same statement.
+
+        With prefix_only, search_term only matches the start of each column, which
+        the lower(column) text_pattern_ops indexes can serve. Results are ordered by id.
+        Pass the id of the last user of a page as after_id to fetch the next page
+        without Postgres having to scan past `offset` rows. Keyset pages return None
+        as the total: counting the whole match set would bring back the full scan
+        that after_id avoids.
+
+        The statement is built as a lambda statement so SQLAlchemy caches its compiled
+        form per combination of filters; the filter values are sent as bound parameters.
+        Results are cached for a short time; any write to the users table clears the cache, and
+        so does the end of the transaction that made it.
         """
-        query = select(cls)
-
-        # Apply search term filter
-        if search_term:
-            search_filter = or_(
-                cls.email.ilike(f"%{search_term}%"),
-                cls.nickname.ilike(f"%{search_term}%"),
-                cls.first_name.ilike(f"%{search_term}%"),
-                cls.last_name.ilike(f"%{search_term}%")
+        # ILIKE and the 'simple' text search config are both case-insensitive
+        search_term = search_term.strip() if search_term else None
+        cache_key = (
+            search_term.lower() if search_term else None,
+            role, is_locked, is_verified, registration_start, registration_end,
+            prefix_only, limit, offset, after_id
+        )
+        # A session with uncommitted user writes must see its own changes, and results it
+        # reads may be rolled back, so it bypasses the shared cache in both directions. That
+        # includes pending changes, which autoflush writes before the search runs.
+        use_cache = not session.info.get(_USER_WRITES_PENDING) and not _has_user_changes(session)
+        cached = _search_cache.get(cache_key) if use_cache else None
+        if cached is not None:
+            # callers get their own copies, so mutating a result cannot corrupt the cache
+            cached_users, total = cached
+            return [dict(user) for user in cached_users], total
+
+        query = cls._apply_search_filters(
+            lambda_stmt(lambda: select(
+                cls.id, cls.email, cls.nickname, cls.first_name, cls.last_name, cls.bio,
+                cls.profile_picture_url, cls.linkedin_profile_url, cls.github_profile_url,
+                cls.is_professional, cls.role, cls.is_locked, cls.email_verified, cls.created_at,
+                func.count().over().label("total_count")
+            )),
+            search_term, role, is_locked, is_verified, registration_start, registration_end, prefix_only
+        )
+        if after_id:
+            query = query.add_criteria(lambda s: s.where(cls.id > after_id))
+        query = query.add_criteria(lambda s: s.order_by(cls.id).limit(limit).offset(offset))
+
+        result = await session.execute(query)
+        users = [dict(row) for row in result.mappings()]
+        total = users[0]["total_count"] if users else 0
+        for user in users:
+            del user["total_count"]
+
+        # The window only sees rows past the after_id cursor, so keyset pages report no
+        # total. An empty offset page past the end has no row to carry the window count;
+        # only then is the match set counted separately.
+        if after_id:
+            total = None
+        elif not users and offset:
+            total = await cls.search_count(
+                session, search_term, role, is_locked, is_verified,
+                registration_start, registration_end, prefix_only
             )
-            query = query.where(search_filter)
 
-        # Apply role filter
+        if use_cache:
+            _search_cache[cache_key] = (tuple(dict(user) for user in users), total)
+        return users, total
+
+    @classmethod
+    async def search_count(cls, session: AsyncSession,
+                           search_term: Optional[str] = None,
+                           role: Optional[UserRole] = None,
+                           is_locked: Optional[bool] = None,
+                           is_verified: Optional[bool] = None,
+                           registration_start: Optional[datetime] = None,
+                           registration_end: Optional[datetime] = None,
+                           prefix_only: bool = False) -> int:
+        """Count all users matching the search criteria, ignoring pagination."""
+        query = cls._apply_search_filters(
+            lambda_stmt(lambda: select(func.count()).select_from(cls)),
+            search_term, role, is_locked, is_verified, registration_start, registration_end, prefix_only
+        )
+        result = await session.execute(query)
+        return result.scalar_one()
+
+    @classmethod
+    def _apply_search_filters(cls, query, search_term, role, is_locked, is_verified,
+                              registration_start, registration_end, prefix_only=False):
+        """Add the WHERE criteria shared by search() and search_count() to a lambda statement."""
+        # Apply search term filter: prefixes are matched through the lower(column) B-tree
+        # indexes and substrings through the trigram indexes. Several words may also match
+        # across fields through the full-text index; a single word never adds a match that
+        # way (its lexeme is a substring too), so it skips that arm. A blank term matches everyone.
+        search_term = search_term.strip() if search_term else None
+        if search_term and prefix_only:
+            prefix = _escape_like(search_term.lower()) + "%"
+            query = query.add_criteria(lambda s: s.where(
+                or_(*(func.lower(c).like(prefix, escape="\\") for c in _SEARCH_COLS))
+            ))
+        elif search_term and len(search_term.split()) > 1:
+            pattern = "%" + _escape_like(search_term.lower()) + "%"
+            query = query.add_criteria(lambda s: s.where(or_(
+                cls.search_vector.op("@@")(func.plainto_tsquery("simple", search_term)),
+                *(c.ilike(pattern, escape="\\") for c in _SEARCH_COLS)
+            )))
+        elif search_term:
+            pattern = "%" + _escape_like(search_term.lower()) + "%"
+            query = query.add_criteria(lambda s: s.where(
+                or_(*(c.ilike(pattern, escape="\\") for c in _SEARCH_COLS))
+            ))
+
+        # Apply role filter. The role code is rendered as a literal, like the flags below, so
+        # generic prepared plans can still use the users_manager partial index.
         if role:
-            query = query.where(cls.role == role)
+            role_code = _ROLE_LITERALS[UserRole(role)]
+            query = query.add_criteria(lambda s: s.where(cls.role == role_code))
+
+        # Apply account status filters. The flags are rendered as literals rather than
+        # bound parameters so generic prepared plans can still use the partial indexes.
+        if is_locked is True:
+            query = query.add_criteria(lambda s: s.where(cls.is_locked == true()))
+        elif is_locked is False:
+            query = query.add_criteria(lambda s: s.where(cls.is_locked == false()))
 
-        # Apply account status filters
-        if is_locked is not None:
-            query = query.where(cls.is_locked == is_locked)
-        
-        if is_verified is not None:
-            query = query.where(cls.email_verified == is_verified)
+        if is_verified is True:
+            query = query.add_criteria(lambda s: s.where(cls.email_verified == true()))
+        elif is_verified is False:
+            query = query.add_criteria(lambda s: s.where(cls.email_verified == false()))
 
         # Apply registration date range filters
         if registration_start:
-            query = query.where(cls.created_at >= registration_start)
+            query = query.add_criteria(lambda s: s.where(cls.created_at >= registration_start))
         if registration_end:
-            query = query.where(cls.created_at <= registration_end)
+            query = query.add_criteria(lambda s: s.where(cls.created_at <= registration_end))
 
-        result = await session.execute(query)
-        return result.scalars().all()
+        return query
+
+    @classmethod
+    async def search_raw(cls, pool, params, limit: int = 50, offset: int = 0) -> List[Any]:
+        """
+        Hot-path variant of search() that bypasses SQLAlchemy and queries asyncpg directly.
+
+        `pool` is an asyncpg pool (or connection) and `params` a UserSearchParams. The SQL
+        text only depends on which filters are set, so asyncpg reuses its prepared statement
+        for every search with the same filter shape. Search terms are matched like in
+        search(). Returns asyncpg Records with the same keys as search(), role included as its name.
+        """
+        sql, args = cls._raw_search_sql(params)
+        sql += f" ORDER BY id LIMIT ${len(args) + 1} OFFSET ${len(args) + 2}"
+        return await pool.fetch(sql, *args, limit, offset)
+
+    @classmethod
+    def _raw_search_sql(cls, params) -> Tuple[str, List[Any]]:
+        """Build the filtered SELECT used by search_raw() and its positional arguments."""
+        conditions = []
+        args = []
+
+        def arg(value) -> str:
+            args.append(value)
+            return f"${len(args)}"
+
+        search_term = params.search_term.strip() if params.search_term else None
+        if search_term and params.prefix_only:
+            prefix = arg(_escape_like(search_term.lower()) + "%")
+            conditions.append("(" + " OR ".join(
+                f"lower({column}) LIKE {prefix} ESCAPE '\\'" for column in _RAW_SEARCH_COLS
+            ) + ")")
+        elif search_term:
+            pattern = arg("%" + _escape_like(search_term.lower()) + "%")
+            arms = [f"{column} ILIKE {pattern} ESCAPE '\\'" for column in _RAW_SEARCH_COLS]
+            if len(search_term.split()) > 1:
+                arms.insert(0, f"search_vector @@ plainto_tsquery('simple', {arg(search_term)})")
+            conditions.append("(" + " OR ".join(arms) + ")")
+        # Literal role codes and flags keep the partial indexes usable, as in search()
+        if params.role:
+            conditions.append(f"role = {_ROLE_CODES[UserRole(params.role)]}")
+        if params.is_locked is not None:
+            conditions.append("is_locked = true" if params.is_locked else "is_locked = false")
+        if params.is_verified is not None:
+            conditions.append("email_verified = true" if params.is_verified else "email_verified = false")
+        if params.registration_start:
+            conditions.append(f"created_at >= {arg(params.registration_start)}")
+        if params.registration_end:
+            conditions.append(f"created_at <= {arg(params.registration_end)}")
+        if params.after_id:
+            conditions.append(f"id > {arg(params.after_id)}")
+
+        sql = _RAW_SEARCH_SELECT
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return sql, args
+
+
+# Columns matched by the search term in User.search
+_SEARCH_COLS = (User.email, User.nickname, User.first_name, User.last_name)
+_RAW_SEARCH_COLS = tuple(column.key for column in _SEARCH_COLS)
+
+# SELECT used by User.search_raw; role codes are turned back into names in SQL
+_RAW_SEARCH_SELECT = (
+    "SELECT id, email, nickname, first_name, last_name, bio, profile_picture_url, "
+    "linkedin_profile_url, github_profile_url, is_professional, "
+    "CASE role " + " ".join(f"WHEN {code} THEN '{role.value}'" for role, code in _ROLE_CODES.items()) + " END AS role, "
+    "is_locked, email_verified, created_at FROM users"
+)
+
+# Trigram GIN indexes let Postgres serve the leading-wildcard ILIKE filters in
+# User.search from an index instead of a sequential scan.
+Index("users_email_trgm", User.email, postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"})
+Index("users_nickname_trgm", User.nickname, postgresql_using="gin", postgresql_ops={"nickname": "gin_trgm_ops"})
+Index("users_first_name_trgm", User.first_name, postgresql_using="gin", postgresql_ops={"first_name": "gin_trgm_ops"})
+Index("users_last_name_trgm", User.last_name, postgresql_using="gin", postgresql_ops={"last_name": "gin_trgm_ops"})
+Index("users_search_vec", User.search_vector, postgresql_using="gin")
+
+# B-tree indexes on lower(column) with text_pattern_ops serve the prefix-only LIKE searches.
+Index("users_email_lower_prefix", func.lower(User.email).label("email_lower"), postgresql_ops={"email_lower": "text_pattern_ops"})
+Index("users_nickname_lower_prefix", func.lower(User.nickname).label("nickname_lower"), postgresql_ops={"nickname_lower": "text_pattern_ops"})
+Index("users_first_name_lower_prefix", func.lower(User.first_name).label("first_name_lower"), postgresql_ops={"first_name_lower": "text_pattern_ops"})
+Index("users_last_name_lower_prefix", func.lower(User.last_name).label("last_name_lower"), postgresql_ops={"last_name_lower": "text_pattern_ops"})
+
+# Covers the common admin filter set (role + lock/verification status + registration
+# date); the INCLUDE columns let Postgres answer it without visiting the heap.
+Index(
+    "users_role_locked_verified_created",
+    User.role, User.is_locked, User.email_verified, User.created_at.desc(),
+    postgresql_include=["id", "email", "nickname"],
+)
+
+# Partial indexes over the rare flag values only; they stay tiny and make filters like
+# is_locked=true proportional to the number of matching users.
+Index("users_locked_true", User.created_at, postgresql_where=(User.is_locked == true()))
+Index("users_unverified", User.created_at, postgresql_where=(User.email_verified == false()))
+Index("users_manager", User.created_at, postgresql_where=(User.role == UserRole.MANAGER))
+
+# gin_trgm_ops is provided by the pg_trgm extension, which must exist before create_all builds the indexes.
+event.listen(User.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+# Leave free space in each page so frequent login bookkeeping updates (last_login_at,
+# failed_login_attempts) can be done as HOT updates without touching the indexes.
+event.listen(User.__table__, "after_create", DDL("ALTER TABLE users SET (fillfactor = 90)"))
+
+
+def _record_user_write(session: Session, connection) -> None:
+    """
+    Drops cached search results and remembers that this session and connection hold user
+    writes that are not committed yet. Until their transaction ends, search() neither
+    reads nor stores cached results for the session, and the end of the transaction
+    (commit or rollback) clears the cache again.
+    """
+    _search_cache.clear()
+    session.info[_USER_WRITES_PENDING] = True
+    connection.info[_USER_WRITES_PENDING] = True
+
+
+def _has_user_changes(session) -> bool:
+    """Whether the session holds User objects that are new, modified or deleted."""
+    return any(isinstance(obj, User) for obj in (*session.new, *session.dirty, *session.deleted))
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_search_cache_on_flush(session, flush_context):
+    """Drops cached search results whenever a User is inserted, updated or deleted."""
+    if _has_user_changes(session):
+        _record_user_write(session, session.connection())
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_search_cache_on_bulk_write(orm_execute_state):
+    """Drops cached search results on bulk INSERT/UPDATE/DELETE statements, which bypass the flush."""
+    if not orm_execute_state.is_select:
+        session = orm_execute_state.session
+        _record_user_write(session, session.connection(bind_arguments=orm_execute_state.bind_arguments))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_pending_user_writes(session, transaction):
+    """The session's writes are committed or rolled back once its outermost transaction ends."""
+    if transaction.parent is None:
+        session.info.pop(_USER_WRITES_PENDING, None)
+
+
+@event.listens_for(Engine, "commit")
+@event.listens_for(Engine, "rollback")
+def _invalidate_search_cache_on_transaction_end(connection):
+    """
+    Drops cached search results when a transaction that wrote users ends. On rollback this
+    removes anything cached while the rolled-back rows were visible; on commit, results other
+    sessions cached between the flush and the commit.
+    """
+    if connection.info.pop(_USER_WRITES_PENDING, False):
+        _search_cache.clear()
@@ -255,8 +255,8 @@ async def search_users(
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(require_role(["ADMIN", "MANAGER"])),
     params: UserSearchParams = Depends(),
-    skip: int = Query(0, description="Number of items to skip"),
-    limit: int = Query(10, description="Number of items to return")
+    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    limit: int = Query(10, ge=1, le=100, description="Number of items to return")
 ):
     """
     Search for users based on various criteria.
@@ -266,30 +266,33 @@ async def search_users(
     - **is_verified**: Filter by email verification status
     - **registration_start**: Filter by registration date start
     - **registration_end**: Filter by registration date end
+    - **prefix_only**: Match search_term only at the start of those fields
+    - **after_id**: Return users after this id (keyset pagination for deep pages); total is null for these pages
     """
-    users = await User.search(
+    paginated_users, total_users = await User.search(
         session=db,
         search_term=params.search_term,
         role=params.role,
         is_locked=params.is_locked,
         is_verified=params.is_verified,
         registration_start=params.registration_start,
-        registration_end=params.registration_end
+        registration_end=params.registration_end,
+        prefix_only=params.prefix_only,
+        limit=limit,
+        offset=skip,
+        after_id=params.after_id
     )
 
-    # Apply pagination
-    total_users = len(users)
-    paginated_users = users[skip:skip + limit]
-
     # Create response with HATEOAS links
     user_responses = [
         UserResponse(
-            **user.__dict__,
-            links=create_user_links(user.id, request)
+            **user,
+            links=create_user_links(user["id"], request)
         ) for user in paginated_users
     ]
 
-    pagination_links = generate_pagination_links(request, skip, limit, total_users)
+    # Keyset (after_id) pages carry no total, so offset-based page links cannot be built for them
+    pagination_links = generate_pagination_links(request, skip, limit, total_users) if total_users is not None else []
 
     return UserListResponse(
         items=user_responses,
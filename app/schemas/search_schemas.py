@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Optional
+from uuid import UUID
 from pydantic import BaseModel
 from app.models.user_model import UserRole
 
@@ -9,4 +10,6 @@ class UserSearchParams(BaseModel):
     is_locked: Optional[bool] = None
     is_verified: Optional[bool] = None
     registration_start: Optional[datetime] = None
-    registration_end: Optional[datetime] = None 
\ No newline at end of file
+    registration_end: Optional[datetime] = None
+    prefix_only: bool = False
+    after_id: Optional[UUID] = None
@@ -94,6 +94,6 @@ class UserListResponse(BaseModel):
         "linkedin_profile_url": "https://linkedin.com/in/johndoe",
         "github_profile_url": "https://github.com/johndoe"
     }])
-    total: int = Field(..., example=100)
+    total: Optional[int] = Field(..., example=100)
     page: int = Field(..., example=1)
     size: int = Field(..., example=10)
\ No newline at end of file
@@ -8,13 +8,20 @@ Fixtures:
 - `async_client`: Manages an asynchronous HTTP client for testing interactions with the FastAPI application.
 - `db_session`: Handles database transactions to ensure a clean database state for each test.
 - User fixtures (`user`, `locked_user`, `verified_user`, etc.): Set up various user states to test different behaviors under diverse conditions.
+- `count_queries` / `query_counter` / `max_queries(n)` marker: Record the SQL statements a test sends; the marker
+  fails the test when its body exceeds the budget.
+- `hashed_test_password`: One hash of the shared test password, computed once per session for the user fixtures.
 - `token`: Generates an authentication token for testing secured endpoints.
 - `initialize_database`: Prepares the database at the session start.
-- `setup_database`: Sets up and tears down the database before and after each test.
+- `engine`, `connection`: One engine and connection shared by the whole test session (all async tests and
+  fixtures run on the session event loop); the schema is created once on that connection and kept between runs.
+- `db_session`: Runs each test inside a transaction on the shared connection and rolls it back afterwards.
 """
 
 # Standard library imports
 from builtins import Exception, range, str
+from contextlib import contextmanager
+from functools import partial
 from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 from uuid import uuid4
@@ -23,8 +30,10 @@ from uuid import uuid4
 import pytest
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
+from pytest_asyncio import is_async_test
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from faker import Faker
 
 # Application-specific imports
@@ -41,9 +50,6 @@ fake = Faker()
 
 settings = get_settings()
 TEST_DATABASE_URL = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
-engine = create_async_engine(TEST_DATABASE_URL, echo=settings.debug)
-AsyncTestingSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-AsyncSessionScoped = scoped_session(AsyncTestingSessionLocal)
 
 
 @pytest.fixture
@@ -75,34 +81,111 @@ def initialize_database():
     except Exception as e:
         pytest.fail(f"Failed to initialize the database: {str(e)}")
 
-# this function setup and tears down (drops tales) for each test function, so you have a clean database for each test.
-@pytest.fixture(scope="function", autouse=True)
-async def setup_database():
-    async with engine.begin() as conn:
+# run every async test on the session event loop (fixtures get it from asyncio_default_fixture_loop_scope),
+# so the session-scoped engine and connection stay usable in every test
+def pytest_collection_modifyitems(items):
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+# transaction bookkeeping for the per-test SAVEPOINTs is not counted against a test's query budget
+_SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+@contextmanager
+def count_queries(engine):
+    """
+    Collect the execution context of every SQL statement sent through the engine while the block runs.
+    Each context carries the statement text (`.statement`) and whether its compiled form came
+    from the cache (`.cache_hit`).
+    """
+    queries = []
+
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and not statement.startswith(_SAVEPOINT_STATEMENTS):
+            queries.append(context)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record_query)
+    try:
+        yield queries
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record_query)
+
+@pytest.fixture
+def query_counter(engine):
+    """Gives tests count_queries() bound to the test engine: `with query_counter() as queries: ...`"""
+    return partial(count_queries, engine)
+
+# wraps only the test call, so the INSERTs made by fixtures do not count against a max_queries budget
+@pytest.hookimpl(wrapper=True)
+def pytest_pyfunc_call(pyfuncitem):
+    marker = pyfuncitem.get_closest_marker("max_queries")
+    if marker is None:
+        return (yield)
+    engine = pyfuncitem.funcargs.get("engine")
+    if engine is None:
+        pytest.fail("max_queries needs a test that uses the database fixtures")
+    with count_queries(engine) as queries:
+        result = yield
+    budget = marker.args[0]
+    if len(queries) > budget:
+        statements = "\n".join(query.statement for query in queries)
+        pytest.fail(f"Expected at most {budget} queries, got {len(queries)}:\n{statements}")
+    return result
+
+@pytest.fixture(scope="session")
+async def engine():
+    # a small real pool (never NullPool) so asyncpg connections, and the statements prepared on them,
+    # are reused for the whole session
+    test_engine = create_async_engine(
+        TEST_DATABASE_URL,
+        echo=settings.debug,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=5,
+    )
+    try:
+        yield test_engine
+    finally:
+        # closes the pooled connections once the whole session is done
+        await test_engine.dispose()
+
+# the schema is created once on a single shared connection and kept between runs; rows left behind by an
+# interrupted run are truncated instead of dropping and recreating every table and index.
+# Trade-off: create_all never alters existing tables, so after a model change drop the test schema by hand.
+@pytest.fixture(scope="session")
+async def connection(engine):
+    async with engine.connect() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    yield
-    async with engine.begin() as conn:
-        # you can comment out this line during development if you are debugging a single test
-         await conn.run_sync(Base.metadata.drop_all)
-    await engine.dispose()
+        await conn.execute(text("TRUNCATE users RESTART IDENTITY CASCADE"))
+        await conn.commit()
+        yield conn
 
+# each test runs in a transaction on the shared connection that is rolled back afterwards, so you have a
+# clean database for each test. Commits made by the code under test only release a SAVEPOINT.
 @pytest.fixture(scope="function")
-async def db_session(setup_database):
-    async with AsyncSessionScoped() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+async def db_session(connection):
+    transaction = await connection.begin()
+    session = AsyncSession(bind=connection, expire_on_commit=False, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        await session.close()
+        await transaction.rollback()
+
+# hashing is deliberately slow, so the user fixtures share one hash of the common test password
+@pytest.fixture(scope="session")
+def hashed_test_password():
+    return hash_password("MySuperPassword$1234")
 
 @pytest.fixture(scope="function")
-async def locked_user(db_session):
+async def locked_user(db_session, hashed_test_password):
     unique_email = fake.email()
     user_data = {
         "nickname": fake.user_name(),
         "first_name": fake.first_name(),
         "last_name": fake.last_name(),
         "email": unique_email,
-        "hashed_password": hash_password("MySuperPassword$1234"),
+        "hashed_password": hashed_test_password,
         "role": UserRole.AUTHENTICATED,
         "email_verified": False,
         "is_locked": True,
@@ -114,13 +197,13 @@ async def locked_user(db_session):
     return user
 
 @pytest.fixture(scope="function")
-async def user(db_session):
+async def user(db_session, hashed_test_password):
     user_data = {
         "nickname": fake.user_name(),
         "first_name": fake.first_name(),
         "last_name": fake.last_name(),
         "email": fake.email(),
-        "hashed_password": hash_password("MySuperPassword$1234"),
+        "hashed_password": hashed_test_password,
         "role": UserRole.AUTHENTICATED,
         "email_verified": False,
         "is_locked": False,
@@ -131,13 +214,13 @@ async def user(db_session):
     return user
 
 @pytest.fixture(scope="function")
-async def verified_user(db_session):
+async def verified_user(db_session, hashed_test_password):
     user_data = {
         "nickname": fake.user_name(),
         "first_name": fake.first_name(),
         "last_name": fake.last_name(),
         "email": fake.email(),
-        "hashed_password": hash_password("MySuperPassword$1234"),
+        "hashed_password": hashed_test_password,
         "role": UserRole.AUTHENTICATED,
         "email_verified": True,
         "is_locked": False,
@@ -148,13 +231,13 @@ async def verified_user(db_session):
     return user
 
 @pytest.fixture(scope="function")
-async def unverified_user(db_session):
+async def unverified_user(db_session, hashed_test_password):
     user_data = {
         "nickname": fake.user_name(),
         "first_name": fake.first_name(),
         "last_name": fake.last_name(),
         "email": fake.email(),
-        "hashed_password": hash_password("MySuperPassword$1234"),
+        "hashed_password": hashed_test_password,
         "role": UserRole.AUTHENTICATED,
         "email_verified": False,
         "is_locked": False,
@@ -185,13 +268,13 @@ async def users_with_same_role_50_users(db_session):
     return users
 
 @pytest.fixture
-async def admin_user(db_session: AsyncSession):
+async def admin_user(db_session: AsyncSession, hashed_test_password: str):
     user = User(
         nickname="admin_user",
         email="admin@example.com",
         first_name="John",
         last_name="Doe",
-        hashed_password="securepassword",
+        hashed_password=hashed_test_password,
         role=UserRole.ADMIN,
         is_locked=False,
     )
@@ -200,13 +283,13 @@ async def admin_user(db_session: AsyncSession):
     return user
 
 @pytest.fixture
-async def manager_user(db_session: AsyncSession):
+async def manager_user(db_session: AsyncSession, hashed_test_password: str):
     user = User(
         nickname="manager_john",
         first_name="John",
         last_name="Doe",
         email="manager_user@example.com",
-        hashed_password="securepassword",
+        hashed_password=hashed_test_password,
         role=UserRole.MANAGER,
         is_locked=False,
     )
@@ -1,6 +1,6 @@
 import pytest
 from datetime import datetime, timedelta
-from app.models.user_model import UserRole
+from app.models.user_model import User, UserRole
 
 @pytest.mark.asyncio
 async def test_search_users_by_term(async_client, admin_token):
@@ -64,4 +64,142 @@ async def test_search_users_combined_filters(async_client, admin_token):
     data = response.json()
     for user in data["items"]:
         assert user["role"] == "AUTHENTICATED"
-        assert user["email_verified"] is True 
\ No newline at end of file
+        assert user["email_verified"] is True 
+
+@pytest.mark.asyncio
+async def test_search_users_pagination(async_client, admin_token, users_with_same_role_50_users):
+    """Test that search paginates in the database, by offset and by keyset"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(
+        "/users/search/?search_term=test_user&skip=0&limit=10",
+        headers=headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 50
+    assert len(data["items"]) == 10
+
+    last_id = data["items"][-1]["id"]
+    response = await async_client.get(
+        f"/users/search/?search_term=test_user&limit=10&after_id={last_id}",
+        headers=headers
+    )
+    assert response.status_code == 200
+    # keyset pages skip the full count of the match set
+    assert response.json()["total"] is None
+    next_page = response.json()["items"]
+    assert len(next_page) == 10
+    first_page_ids = {user["id"] for user in data["items"]}
+    assert not first_page_ids & {user["id"] for user in next_page}
+
+
+@pytest.mark.asyncio
+async def test_search_users_prefix_only(async_client, admin_token):
+    """Test that prefix_only matches the start of a field but not the middle"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(
+        "/users/search/?search_term=ADM&prefix_only=true",
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert any(user["email"] == "admin@example.com" for user in response.json()["items"])
+
+    response = await async_client.get(
+        "/users/search/?search_term=dmin&prefix_only=true",
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_search_users_wildcards_match_literally(async_client, admin_token):
+    """Test that % and _ in the search term are not treated as LIKE wildcards"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(
+        "/users/search/?search_term=%25",
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+
+    response = await async_client.get(
+        "/users/search/?search_term=n_u",
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert any(user["nickname"] == "admin_user" for user in response.json()["items"])
+
+
+@pytest.mark.asyncio
+async def test_search_users_blank_term(async_client, admin_token):
+    """Test that a blank search term does not filter the results"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(
+        "/users/search/?search_term=%20%20",
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_users_full_text_words(async_client, admin_token):
+    """Test that whole words are matched across fields through the full-text index"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    # no single field contains "john doe", but first_name and last_name hold one word each
+    response = await async_client.get(
+        "/users/search/?search_term=john%20doe",
+        headers=headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["items"][0]["email"] == "admin@example.com"
+
+
+@pytest.mark.asyncio
+async def test_search_users_single_word_keeps_substring_matches(async_client, admin_token, db_session):
+    """Test that a single word still matches inside longer names and email addresses"""
+    db_session.add_all([
+        User(nickname="jdoe", email="jdoe@example.com", first_name="Mary", last_name="Johnson",
+             hashed_password="securepassword", role=UserRole.AUTHENTICATED),
+        User(nickname="jsmith", email="john.smith@example.com", first_name="Jim", last_name="Smith",
+             hashed_password="securepassword", role=UserRole.AUTHENTICATED),
+    ])
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(
+        "/users/search/?search_term=john",
+        headers=headers
+    )
+    assert response.status_code == 200
+    emails = {user["email"] for user in response.json()["items"]}
+    assert emails == {"admin@example.com", "jdoe@example.com", "john.smith@example.com"}
+
+
+@pytest.mark.asyncio
+async def test_search_users_full_text_and_substring_hits_together(async_client, admin_token, db_session):
+    """Test that several words return both full-text and substring-only matches in one result"""
+    # "Doe Johnson" contains "doe john" but not the word "john"; John Doe has both words in separate fields
+    db_session.add(User(nickname="mdoe", email="mdoe@example.com", first_name="Mary", last_name="Doe Johnson",
+                        hashed_password="securepassword", role=UserRole.AUTHENTICATED))
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(
+        "/users/search/?search_term=doe%20john",
+        headers=headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert {user["email"] for user in data["items"]} == {"admin@example.com", "mdoe@example.com"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", ["skip=-1", "limit=0", "limit=-5", "limit=101"])
+async def test_search_users_rejects_invalid_pagination(async_client, admin_token, query):
+    """Test that out-of-range skip/limit values are rejected before reaching the database"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(f"/users/search/?{query}", headers=headers)
+    assert response.status_code == 422
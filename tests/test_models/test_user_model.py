@@ -1,11 +1,28 @@
 from builtins import repr
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.user_model import User, UserRole
-from sqlalchemy import event
+from app.models.user_model import User, UserRole, _search_cache
+from app.schemas.search_schemas import UserSearchParams
+from sqlalchemy import insert, lambda_stmt, select, text, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
 
-@pytest.mark.asyncio
+@pytest.fixture
+def make_user(hashed_test_password):
+    """Build an unpersisted user with sensible defaults; keyword arguments override any field."""
+    def _make_user(**overrides) -> User:
+        user_data = {
+            "nickname": "test_user",
+            "email": "test_user@example.com",
+            "hashed_password": hashed_test_password,
+            "role": UserRole.AUTHENTICATED,
+        }
+        user_data.update(overrides)
+        return User(**user_data)
+    return _make_user
+
+@pytest.mark.max_queries(0)
 async def test_user_role(db_session: AsyncSession, user: User, admin_user: User, manager_user: User):
     """
     Tests that the default role is assigned correctly and can be updated.
@@ -14,7 +31,7 @@ async def test_user_role(db_session: AsyncSession, user: User, admin_user: User,
     assert admin_user.role == UserRole.ADMIN, "Admin role should be correctly assigned"
     assert manager_user.role == UserRole.MANAGER, "Pro role should be correctly assigned"
 
-@pytest.mark.asyncio
+@pytest.mark.max_queries(0)
 async def test_has_role(user: User, admin_user: User, manager_user: User):
     """
     Tests the has_role method to ensure it accurately checks the user's role.
@@ -24,14 +41,14 @@ async def test_has_role(user: User, admin_user: User, manager_user: User):
     assert admin_user.has_role(UserRole.ADMIN), "Admin user should have ADMIN role"
     assert manager_user.has_role(UserRole.MANAGER), "Pro user should have PRO role"
 
-@pytest.mark.asyncio
+@pytest.mark.max_queries(0)
 async def test_user_repr(user: User):
     """
     Tests the __repr__ method for accurate representation of the User object.
     """
     assert repr(user) == f"<User {user.nickname}, Role: {user.role.name}>", "__repr__ should include nickname and role"
 
-@pytest.mark.asyncio
+@pytest.mark.max_queries(1)
 async def test_failed_login_attempts_increment(db_session: AsyncSession, user: User):
     """
     Tests that failed login attempts can be incremented and persisted correctly.
@@ -39,10 +56,9 @@ async def test_failed_login_attempts_increment(db_session: AsyncSession, user: U
     initial_attempts = user.failed_login_attempts
     user.failed_login_attempts += 1
     await db_session.commit()
-    await db_session.refresh(user)
     assert user.failed_login_attempts == initial_attempts + 1, "Failed login attempts should increment"
 
-@pytest.mark.asyncio
+@pytest.mark.max_queries(1)
 async def test_last_login_update(db_session: AsyncSession, user: User):
     """
     Tests updating the last login timestamp.
@@ -50,10 +66,9 @@ async def test_last_login_update(db_session: AsyncSession, user: User):
     new_last_login = datetime.now(timezone.utc)
     user.last_login_at = new_last_login
     await db_session.commit()
-    await db_session.refresh(user)
     assert user.last_login_at == new_last_login, "Last login timestamp should update correctly"
 
-@pytest.mark.asyncio
+@pytest.mark.max_queries(2)
 async def test_account_lock_and_unlock(db_session: AsyncSession, user: User):
     """
     Tests locking and unlocking the user account.
@@ -64,16 +79,14 @@ async def test_account_lock_and_unlock(db_session: AsyncSession, user: User):
     # Lock the account and verify.
     user.lock_account()
     await db_session.commit()
-    await db_session.refresh(user)
     assert user.is_locked, "Account should be locked after calling lock_account()"
 
     # Unlock the account and verify.
     user.unlock_account()
     await db_session.commit()
-    await db_session.refresh(user)
     assert not user.is_locked, "Account should be unlocked after calling unlock_account()"
 
-@pytest.mark.asyncio
+@pytest.mark.max_queries(1)
 async def test_email_verification(db_session: AsyncSession, user: User):
     """
     Tests the email verification functionality.
@@ -84,100 +97,58 @@ async def test_email_verification(db_session: AsyncSession, user: User):
     # Verify the email and check.
     user.verify_email()
     await db_session.commit()
-    await db_session.refresh(user)
     assert user.email_verified, "Email should be verified after calling verify_email()"
 
-@pytest.mark.asyncio
-async def test_user_profile_pic_url_update(db_session: AsyncSession, user: User):
+@pytest.mark.max_queries(1)
+async def test_user_profile_urls_update(db_session: AsyncSession, user: User):
     """
-    Tests the profile pic update functionality.
+    Tests that the profile picture, LinkedIn and GitHub URLs can be updated together.
     """
-    # Initially, the profile pic should be updated.
-
-    # Verify the email and check.
     profile_pic_url = "http://myprofile/picture.png"
-    user.profile_picture_url = profile_pic_url
-    await db_session.commit()
-    await db_session.refresh(user)
-    assert user.profile_picture_url == profile_pic_url, "The profile pic did not update"
-
-@pytest.mark.asyncio
-async def test_user_linkedin_url_update(db_session: AsyncSession, user: User):
-    """
-    Tests the profile pic update functionality.
-    """
-    # Initially, the linkedin should  be updated.
-
-    # Verify the linkedin profile url.
     profile_linkedin_url = "http://www.linkedin.com/profile"
-    user.linkedin_profile_url = profile_linkedin_url
-    await db_session.commit()
-    await db_session.refresh(user)
-    assert user.linkedin_profile_url == profile_linkedin_url, "The profile pic did not update"
-
-
-@pytest.mark.asyncio
-async def test_user_github_url_update(db_session: AsyncSession, user: User):
-    """
-    Tests the profile pic update functionality.
-    """
-    # Initially, the linkedin should  be updated.
-
-    # Verify the linkedin profile url.
     profile_github_url = "http://www.github.com/profile"
+    user.profile_picture_url = profile_pic_url
+    user.linkedin_profile_url = profile_linkedin_url
     user.github_profile_url = profile_github_url
     await db_session.commit()
-    await db_session.refresh(user)
+    assert user.profile_picture_url == profile_pic_url, "The profile pic did not update"
+    assert user.linkedin_profile_url == profile_linkedin_url, "The linkedin url did not update"
     assert user.github_profile_url == profile_github_url, "The github did not update"
 
 
-@pytest.mark.asyncio
+@pytest.mark.max_queries(1)
 async def test_update_user_role(db_session: AsyncSession, user: User):
     """
     Tests updating the user's role and ensuring it persists correctly.
     """
     user.role = UserRole.ADMIN
     await db_session.commit()
-    await db_session.refresh(user)
     assert user.role == UserRole.ADMIN, "Role update should persist correctly in the database"
 
-@pytest.mark.asyncio
-async def test_user_nickname_uniqueness(db_session):
+async def test_user_nickname_uniqueness(db_session, make_user):
     """Test that users cannot have duplicate nicknames"""
     nickname = "unique_nickname"
     
-    # Create first user
-    user1 = User(
-        nickname=nickname,
-        email="user1@example.com",
-        hashed_password="password",
-        role=UserRole.AUTHENTICATED
-    )
-    db_session.add(user1)
-    await db_session.commit()
-    
-    # Try to create second user with same nickname
-    user2 = User(
-        nickname=nickname,
-        email="user2@example.com",
-        hashed_password="password",
-        role=UserRole.AUTHENTICATED
-    )
-    db_session.add(user2)
-    with pytest.raises(Exception):  # Should raise an integrity error
-        await db_session.commit()
+    # Insert both users in a single flush; the second one reuses the nickname
+    db_session.add_all([
+        make_user(nickname=nickname, email="user1@example.com"),
+        make_user(nickname=nickname, email="user2@example.com"),
+    ])
+    with pytest.raises(IntegrityError):
+        await db_session.flush()
+    await db_session.rollback()
 
-@pytest.mark.asyncio
+@pytest.mark.max_queries(3)
 async def test_user_role_transition(db_session, user):
     """Test transitioning user through different roles"""
     # Start as ANONYMOUS
     user.role = UserRole.ANONYMOUS
-    await db_session.commit()
+    await db_session.flush()
     assert user.role == UserRole.ANONYMOUS
     
     # Upgrade to AUTHENTICATED
     user.role = UserRole.AUTHENTICATED
-    await db_session.commit()
+    await db_session.flush()
     assert user.role == UserRole.AUTHENTICATED
     
     # Upgrade to MANAGER
@@ -185,35 +156,210 @@ async def test_user_role_transition(db_session, user):
     await db_session.commit()
     assert user.role == UserRole.MANAGER
 
-@pytest.mark.asyncio
+async def test_role_updates_reuse_compiled_statement(db_session, user, query_counter):
+    """Test that repeated UPDATE statements of the same shape are served from the engine's compiled cache"""
+    # session.execute() statements go through the engine's compiled cache;
+    # flush UPDATEs would not, as the ORM keeps those in a per-mapper cache of its own
+    with query_counter() as queries:
+        for role in (UserRole.ANONYMOUS, UserRole.AUTHENTICATED, UserRole.MANAGER):
+            await db_session.execute(update(User).where(User.id == user.id).values(role=role))
+
+    updates = [query for query in queries if query.statement.startswith("UPDATE users")]
+    assert len(updates) == 3
+    assert all(query.cache_hit == query.dialect.CACHE_HIT for query in updates[1:]), \
+        "Only the first UPDATE should need compiling"
+
+async def test_role_updates_reuse_prepared_statement(db_session, user, query_counter):
+    """Test that repeated UPDATE statements of the same shape are prepared only once on the server"""
+    with query_counter() as queries:
+        for role in (UserRole.ANONYMOUS, UserRole.AUTHENTICATED, UserRole.MANAGER):
+            await db_session.execute(update(User).where(User.id == user.id).values(role=role))
+
+    # asyncpg prepares each distinct statement text once per connection and reuses it
+    statements = {query.statement for query in queries if query.statement.startswith("UPDATE users")}
+    assert len(statements) == 1
+    result = await db_session.execute(
+        text("SELECT count(*) FROM pg_prepared_statements WHERE statement = :statement"),
+        {"statement": statements.pop()}
+    )
+    assert result.scalar_one() == 1
+
+@pytest.mark.max_queries(2)
 async def test_professional_status_timestamp(db_session, user):
     """Test that professional status updates timestamp"""
-    # Update the professional status using the update method
+    # The timestamp is set in Python, so the flushed UPDATE leaves nothing to refresh
     user.update_professional_status(True)
-    await db_session.commit()
-    
-    # Refresh the user to get the updated timestamp
-    await db_session.refresh(user)
-    
-    # Assert that the timestamp exists and is recent
+    await db_session.flush()
     assert user.professional_status_updated_at is not None
-    assert user.is_professional is True
 
-@pytest.mark.asyncio
-async def test_user_model_defaults(db_session):
+    # Assert that the status and the same timestamp were written to the database
+    result = await db_session.execute(
+        select(User.is_professional, User.professional_status_updated_at).where(User.id == user.id)
+    )
+    stored = result.one()
+    assert stored.is_professional is True
+    assert stored.professional_status_updated_at == user.professional_status_updated_at
+
+async def test_user_model_defaults(db_session, hashed_test_password):
     """Test default values when creating a new user"""
-    user = User(
-        nickname="test_defaults",
-        email="defaults@example.com",
-        hashed_password="password",
-        role=UserRole.AUTHENTICATED
+    # a plain INSERT ... RETURNING is enough to see the column defaults; no unit of work needed
+    users = User.__table__
+    result = await db_session.execute(
+        insert(users)
+        .values(
+            nickname="test_defaults",
+            email="defaults@example.com",
+            hashed_password=hashed_test_password,
+            role=UserRole.AUTHENTICATED
+        )
+        .returning(
+            users.c.failed_login_attempts, users.c.is_locked, users.c.is_professional,
+            users.c.email_verified, users.c.created_at, users.c.updated_at
+        )
     )
-    db_session.add(user)
-    await db_session.commit()
+    row = result.one()
     
-    assert user.failed_login_attempts == 0
-    assert user.is_locked is False
-    assert user.is_professional is False
-    assert user.email_verified is False
-    assert user.created_at is not None
-    assert user.updated_at is not None
+    assert row.failed_login_attempts == 0
+    assert row.is_locked is False
+    assert row.is_professional is False
+    assert row.email_verified is False
+    assert row.created_at is not None
+    assert row.updated_at is not None
+
+async def test_search_raw(db_session, admin_user, manager_user):
+    """Test that the raw asyncpg search applies filters and returns role names"""
+    connection = await db_session.connection()
+    raw_connection = await connection.get_raw_connection()
+    records = await User.search_raw(
+        raw_connection.driver_connection,
+        UserSearchParams(search_term="john", role=UserRole.MANAGER)
+    )
+    assert [record["id"] for record in records] == [manager_user.id]
+    assert UserRole(records[0]["role"]) == UserRole.MANAGER
+
+_NOW = datetime.now(timezone.utc)
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"search_term": "john"},
+    {"search_term": "john doe"},
+    {"search_term": "test_user"},
+    {"search_term": "ADM", "prefix_only": True},
+    {"role": UserRole.MANAGER},
+    {"role": UserRole.AUTHENTICATED, "is_verified": True},
+    {"is_locked": True},
+    {"is_locked": False, "is_verified": False},
+    {"registration_start": _NOW - timedelta(days=1), "registration_end": _NOW + timedelta(days=1)},
+    {"registration_end": _NOW - timedelta(days=1)},
+])
+async def test_search_raw_matches_search(db_session, admin_user, manager_user, locked_user, verified_user,
+                                         users_with_same_role_50_users, filters):
+    """Test that the raw asyncpg search returns the same users as User.search for each filter branch"""
+    connection = await db_session.connection()
+    raw_connection = (await connection.get_raw_connection()).driver_connection
+    first_id = min(user.id for user in users_with_same_role_50_users)
+
+    # every filter combination is also checked as a keyset page
+    for after_id in (None, first_id):
+        records = await User.search_raw(raw_connection, UserSearchParams(**filters, after_id=after_id))
+        users, _ = await User.search(db_session, **filters, after_id=after_id)
+        assert [(record["id"], UserRole(record["role"])) for record in records] == \
+            [(user["id"], user["role"]) for user in users]
+
+@pytest.mark.max_queries(1)
+async def test_search_keyset_page_skips_count(db_session, users_with_same_role_50_users):
+    """Test that a keyset page is fetched in one query and reports no total"""
+    first_id = min(user.id for user in users_with_same_role_50_users)
+    users, total = await User.search(db_session, search_term="test_user", limit=10, after_id=first_id)
+    assert len(users) == 10
+    assert all(user["id"] > first_id for user in users)
+    assert total is None
+
+@pytest.mark.max_queries(1)
+async def test_search_several_words_match_across_fields(db_session, admin_user):
+    """Test that a multi-word search matches words spread over several fields in one query"""
+    users, total = await User.search(db_session, search_term="John Doe")
+    assert [user["id"] for user in users] == [admin_user.id]
+    assert total == 1
+
+async def test_search_results_are_cached(db_session, user, query_counter):
+    """Test that repeating a search, up to case and surrounding blanks, is served from the cache"""
+    first_users, first_total = await User.search(db_session, search_term=user.nickname)
+    # mutating a returned result must not change what later callers get
+    first_users[0]["nickname"] = "mutated"
+    first_users.clear()
+
+    with query_counter() as queries:
+        users, total = await User.search(db_session, search_term=f"  {user.nickname.upper()} ")
+    assert queries == []
+    assert [found["nickname"] for found in users] == [user.nickname]
+    assert total == first_total == 1
+
+async def test_search_cache_cleared_by_insert(db_session, user, make_user, query_counter):
+    """Test that inserting a user drops cached search results"""
+    await User.search(db_session, search_term="cachetest")
+    assert _search_cache
+    db_session.add(make_user(nickname="cachetest", email="cachetest@example.com"))
+    await db_session.flush()
+    assert not _search_cache
+    with query_counter() as queries:
+        users, total = await User.search(db_session, search_term="cachetest")
+    assert len(queries) == 1
+    assert total == 1
+
+async def test_search_cache_cleared_by_update(db_session, user, query_counter):
+    """Test that updating a user drops cached search results"""
+    await User.search(db_session, search_term=user.nickname)
+    assert _search_cache
+    user.first_name = "Changed"
+    await db_session.flush()
+    assert not _search_cache
+    with query_counter() as queries:
+        users, total = await User.search(db_session, search_term=user.nickname)
+    assert len(queries) == 1
+    assert users[0]["first_name"] == "Changed"
+
+async def test_search_cache_cleared_by_bulk_update(db_session, user, query_counter):
+    """Test that a bulk UPDATE, which bypasses the flush, drops cached search results"""
+    await User.search(db_session, search_term=user.nickname)
+    assert _search_cache
+    await db_session.execute(update(User).where(User.id == user.id).values(first_name="Changed"))
+    assert not _search_cache
+    with query_counter() as queries:
+        users, total = await User.search(db_session, search_term=user.nickname)
+    assert len(queries) == 1
+    assert users[0]["first_name"] == "Changed"
+
+async def test_search_cache_skips_uncommitted_rows(db_session, make_user):
+    """Test that rows seen before a rollback are never served from the cache afterwards"""
+    db_session.add(make_user(nickname="phantom", email="phantom@example.com"))
+    await db_session.flush()
+    users, total = await User.search(db_session, search_term="phantom")
+    assert total == 1
+    # results read with uncommitted user writes are not shared with other sessions
+    assert not _search_cache
+
+    await db_session.rollback()
+    users, total = await User.search(db_session, search_term="phantom")
+    assert users == []
+    assert total == 0
+
+async def test_search_sees_pending_changes(db_session, user, make_user):
+    """Test that a search includes the session's own unflushed inserts and updates"""
+    # cache a result for the term first, so a stale cache hit would also be caught
+    await User.search(db_session, search_term="pendingname")
+
+    db_session.add(make_user(nickname="pendingname", email="pending@example.com"))
+    user.last_name = "Pendingname"
+    users, total = await User.search(db_session, search_term="pendingname")
+    assert total == 2
+    assert user.id in {found["id"] for found in users}
+
+def test_search_role_filter_is_literal():
+    """Test that the role filter renders the role code inline, so the users_manager partial index can match"""
+    query = User._apply_search_filters(
+        lambda_stmt(lambda: select(User.id)), None, UserRole.MANAGER, None, None, None, None
+    )
+    compiled = query.compile(dialect=postgresql.asyncpg.dialect())
+    assert "users.role = 2" in str(compiled)
+    assert not compiled.params